@@ -1,17 +1,56 @@
+import asyncio
 import boto3
 import ffmpeg
+import json
 import os
+import shutil
 import sys
-import re
+import subprocess
+import threading
+import time
+import unicodedata
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    import PyNvVideoCodec as nvc
+except ImportError:
+    nvc = None
 
 # --- 사용자 설정 ---
 LOCAL_TEST_FILE = 'sample.mov'
+SELFTEST_CACHE_FILE = '.selftest_ok'  # 사전 테스트 통과 기록. 24시간 동안은 테스트를 다시 하지 않습니다.
+SELFTEST_CACHE_SECONDS = 24 * 3600
 FFMPEG_PATH = '/opt/homebrew/bin/ffmpeg'
 BUCKET_NAME = 'base-inbrain-resource'
 PREFIX_TO_SCAN = 'lectures/'
 CLOUDFRON_DOMAIN = 'media.basemath.co.kr'
 BITRATE_THRESHOLD = 5000000
 TARGET_BITRATE = 4000000
+NVENC_PRESET = 'p4'
+NVENC_TUNE = 'hq'  # VOD 변환이므로 저지연(ll) 대신 화질 우선 튜닝을 사용합니다.
+# CDN 스트리밍용 출력 설정: 프레임 레이트와 상관없이 2초마다 키프레임, B-프레임 없음, moov 박스를 파일 앞으로(faststart)
+KEYFRAME_INTERVAL_SECONDS = 2
+OUTPUT_BFRAMES = 0
+TRANSCODE_BATCH_SIZE = 4  # FFmpeg 한 번에 묶어서 변환할 파일 수
+PROBE_WORKERS = 32  # 메타데이터 조회/프로브를 동시에 실행할 스레드 수
+MAX_CONCURRENT_TRANSCODES = 2  # 동시에 실행할 변환 작업 수
+# 동시에 열 수 있는 NVENC 세션 수 (일반 소비자용 GPU는 드라이버가 세션 수를 제한합니다).
+# NVENC 사용 시 묶음 크기는 MAX_NVENC_SESSIONS // MAX_CONCURRENT_TRANSCODES 이하로 줄어듭니다.
+MAX_NVENC_SESSIONS = 4
+PIPELINE_QUEUE_SIZE = 3  # 단계 사이에 대기할 수 있는 파일 수 (임시 파일 사용량 제한)
+# 크기 조정/필터 (기본값은 필터 없음). GPU 경로에서는 디코딩된 프레임에 CPU 필터를 적용한 뒤
+# format=nv12,hwupload_cuda로 VRAM에 올리고, 크기 조정은 scale_cuda로 GPU에서 처리합니다.
+OUTPUT_SIZE = None  # 예: (1280, 720)
+CPU_FILTERS = None  # 예: "fade=t=in:st=0:d=1"
+STREAM_IO = False  # True면 /tmp를 거치지 않고 S3 → FFmpeg → S3로 바로 스트리밍합니다 (결과는 fragmented MP4)
+# True면 원본은 그대로 두고 '<키에서 확장자 제외>/dash/' 아래에 DASH(CMAF) 세그먼트를 만들어,
+# 세그먼트가 완성되는 대로 업로드합니다. 매니페스트(manifest.mpd)는 마지막에 업로드됩니다.
+DASH_OUTPUT = False
+DASH_SEGMENT_SECONDS = 4
 DRY_RUN = False
 folders_to_process = [
     "공수2 1강",
@@ -23,39 +62,314 @@ folders_to_process = [
 ]
 # -------------------------------------------
 
-def run_ffmpeg_with_progress(ffmpeg_process):
-    """FFmpeg 프로세스를 실행하고 실시간 진행률을 출력합니다."""
-    process = ffmpeg_process.run_async(cmd=FFMPEG_PATH, pipe_stderr=True)
+# 모든 폴더/워커가 하나의 클라이언트를 공유해서 세션 생성과 TLS 연결 비용을 한 번만 냅니다.
+S3_CLIENT = boto3.client('s3', config=Config(
+    max_pool_connections=64,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True,
+))
+
+MB = 1024 * 1024
+# 대용량 강의 파일을 여러 파트로 나눠 동시에 전송합니다.
+TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * MB, multipart_chunksize=16 * MB,
+                                 max_concurrency=16, use_threads=True)
+
+# 모든 폴더가 함께 사용하는 프로브용 스레드 풀
+PROBE_EXECUTOR = ThreadPoolExecutor(max_workers=PROBE_WORKERS)
+
+# CUDA 초기화 시 생성하는 작업 큐 수를 줄여 컨텍스트 준비 시간을 단축합니다.
+os.environ.setdefault('CUDA_DEVICE_MAX_CONNECTIONS', '2')
+
+
+async def run_ffmpeg_with_progress(ffmpeg_process, label=''):
+    """FFmpeg 프로세스를 실행하고 실시간 진행률을 출력합니다.
 
+    진행률은 -progress pipe:1 (stdout)의 key=value 줄로 받고, stderr는 오류 메시지 전용으로 남겨 둡니다.
+    여러 FFmpeg가 동시에 실행되므로 -nostdin으로 터미널 입력(키 입력, tty 모드)을 건드리지 않게 합니다.
+    """
+    args = (
+        ffmpeg_process
+        .global_args('-nostdin', '-progress', 'pipe:1', '-nostats', '-loglevel', 'error')
+        .compile(cmd=FFMPEG_PATH)
+    )
+    process = await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.PIPE,
+                                                   stderr=asyncio.subprocess.PIPE)
+    # stderr는 파이프가 가득 차지 않도록 동시에 읽어 둡니다.
+    stderr_task = asyncio.create_task(process.stderr.read())
+
+    progress = {}
+    pending = b''
     while True:
-        line = process.stderr.readline()
-        if not line:
+        # 줄 단위가 아니라 64 KiB씩 읽어서, 밀려 있던 출력을 한 번에 처리합니다.
+        chunk = await process.stdout.read(65536)
+        if not chunk:
             break
 
-        line = line.decode('utf-8').strip()
-        # "time=00:00:15.32" 와 "speed=2.5x" 같은 정보를 찾습니다.
-        time_match = re.search(r'time=(\S+)', line)
-        speed_match = re.search(r'speed=(\S+)', line)
+        *lines, pending = (pending + chunk).split(b'\n')
+        block_finished = False
+        for line in lines:
+            key, _, value = line.strip().partition(b'=')
+            progress[key] = value
+            # 한 묶음의 진행 정보는 "progress=continue|end" 줄로 끝납니다.
+            if key == b'progress':
+                block_finished = True
 
-        if time_match and speed_match:
-            progress_time = time_match.group(1)
-            speed = speed_match.group(1)
+        # 여러 묶음이 한 번에 들어왔어도 가장 최근 값으로 한 번만 출력합니다.
+        if block_finished:
+            progress_time = progress.get(b'out_time', b'').decode()
+            speed = progress.get(b'speed', b'').decode()
             # 한 줄에 계속 갱신해서 보여주기
-            print(f"    ⏳ 진행 시간: {progress_time} / 속도: {speed}", end='\r')
+            print(f"    ⏳ {label} 진행 시간: {progress_time} / 속도: {speed}", end='\r')
 
     # 최종 결과 확인
-    return_code = process.wait()
+    return_code = await process.wait()
+    error_output = (await stderr_task).decode('utf-8', errors='replace')
     print() # 줄바꿈
     if return_code != 0:
-        # wait() 이후에 에러 내용을 다시 읽습니다.
-        error_output = process.stderr.read().decode('utf8')
         raise ffmpeg.Error('ffmpeg', None, error_output)
 
 
+@lru_cache(maxsize=None)
+def _nvenc_available():
+    """FFmpeg 빌드에 h264_nvenc 인코더가 포함되어 있는지 확인합니다."""
+    try:
+        result = subprocess.run([FFMPEG_PATH, '-hide_banner', '-encoders'],
+                                capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return b'h264_nvenc' in result.stdout
+
+
+def _video_filter(use_nvenc):
+    """OUTPUT_SIZE/CPU_FILTERS 설정으로 -vf 필터 문자열을 만듭니다. 설정이 없으면 None을 반환합니다."""
+    if not (OUTPUT_SIZE or CPU_FILTERS):
+        return None
+    filters = []
+    if use_nvenc:
+        # 필터를 쓸 때는 디코딩된 프레임을 시스템 메모리로 받습니다 (_transcode_output 참고).
+        # ProRes 같은 소프트웨어 디코딩 프레임이나 10비트/4:2:2 프레임도 format=nv12에서 변환되어 업로드됩니다.
+        if CPU_FILTERS:
+            filters.append(CPU_FILTERS)
+        filters += ['format=nv12', 'hwupload_cuda']
+        if OUTPUT_SIZE:
+            width, height = OUTPUT_SIZE
+            filters.append(f'scale_cuda={width}:{height}:interp_algo=lanczos:format=nv12')
+    else:
+        if CPU_FILTERS:
+            filters.append(CPU_FILTERS)
+        if OUTPUT_SIZE:
+            width, height = OUTPUT_SIZE
+            filters.append(f'scale={width}:{height}:flags=lanczos')
+    return ','.join(filters)
+
+
+def _transcode_output(src, dst, use_nvenc=True, **extra_kwargs):
+    """원본 하나를 변환하는 FFmpeg 출력 노드를 만듭니다. use_nvenc=False면 NVENC가 있어도 libx264를 사용합니다."""
+    use_nvenc = use_nvenc and _nvenc_available()
+    if use_nvenc:
+        if OUTPUT_SIZE or CPU_FILTERS:
+            # 필터 그래프가 하드웨어/소프트웨어 디코딩 프레임을 모두 받을 수 있도록 시스템 메모리 프레임으로 디코딩합니다.
+            stream = ffmpeg.input(src, hwaccel='cuda')
+        else:
+            # 디코딩된 프레임을 VRAM에 그대로 두고 NVENC로 넘깁니다.
+            stream = ffmpeg.input(src, hwaccel='cuda', hwaccel_output_format='cuda')
+        # forced_idr: 강제 키프레임을 IDR로 만들어 세그먼트/탐색 지점에서 바로 디코딩할 수 있게 합니다.
+        output_kwargs = dict(vcodec='h264_nvenc', preset=NVENC_PRESET, tune=NVENC_TUNE, rc='vbr', forced_idr=1)
+    else:
+        stream = ffmpeg.input(src)
+        output_kwargs = dict(vcodec='libx264')
+    output_kwargs.update(force_key_frames=f'expr:gte(t,n_forced*{KEYFRAME_INTERVAL_SECONDS})',
+                         bf=OUTPUT_BFRAMES, movflags='+faststart')
+    video_filter = _video_filter(use_nvenc)
+    if video_filter:
+        output_kwargs['vf'] = video_filter
+    output_kwargs.update(extra_kwargs)
+    # 값이 None인 옵션은 제외합니다 (예: DASH 출력에서는 movflags를 쓰지 않음).
+    output_kwargs = {k: v for k, v in output_kwargs.items() if v is not None}
+    # 입력이 여러 개일 수 있으므로 각 출력에 자신의 영상/오디오 스트림을 명시적으로 매핑합니다.
+    return ffmpeg.output(stream['v'], stream['a?'], dst, video_bitrate=TARGET_BITRATE, acodec='copy',
+                         **output_kwargs)
+
+
+def build_transcode(jobs, use_nvenc=True):
+    """(원본, 결과) 경로 쌍들을 하나의 FFmpeg 명령으로 묶습니다.
+
+    NVENC 사용 가능 시 디코딩/인코딩을 모두 GPU에서 수행하고, 아니면 libx264로 변환합니다.
+    여러 파일을 한 프로세스에서 처리하면 CUDA 컨텍스트와 NVENC 세션 초기화 비용을 한 번만 냅니다.
+    """
+    outputs = [_transcode_output(src, dst, use_nvenc) for src, dst in jobs]
+    return (
+        ffmpeg
+        .merge_outputs(*outputs)
+        .overwrite_output()
+    )
+
+
+def _encode_pynvc(src, elementary_path, bitrate):
+    """PyNvVideoCodec으로 영상 스트림만 NVDEC → NVENC 변환해 H.264 엘리멘터리 스트림으로 저장합니다.
+
+    디먹서/디코더가 입력을 지원하지 않으면 ValueError를 발생시킵니다. 인코더 오류 등 그 밖의 실패는 그대로 전달됩니다.
+    """
+    try:
+        demuxer = nvc.CreateDemuxer(filename=src)
+        decoder = nvc.CreateDecoder(gpuid=0, codec=demuxer.GetNvCodecId(), cudacontext=0, cudastream=0,
+                                    usedevicememory=True)
+    except Exception as e:
+        raise ValueError(f"PyNvVideoCodec 디코더 미지원 입력 ({e})") from e
+    fps = demuxer.FrameRate()
+    encoder = nvc.CreateEncoder(demuxer.Width(), demuxer.Height(), 'NV12', False,
+                                codec='h264', preset='P4', rc='vbr', bitrate=bitrate, fps=fps,
+                                gop=max(1, round(fps * KEYFRAME_INTERVAL_SECONDS)), bf=OUTPUT_BFRAMES)
+
+    frame_count = 0
+    with open(elementary_path, 'wb') as f:
+        for packet in demuxer:
+            # 디코딩된 프레임은 CUDA 디바이스 포인터 그대로 인코더에 넘깁니다 (호스트 복사 없음).
+            for frame in decoder.Decode(packet):
+                f.write(bytearray(encoder.Encode(frame)))
+                frame_count += 1
+                if frame_count % 300 == 0:
+                    print(f"    ⏳ {os.path.basename(src)} 인코딩된 프레임: {frame_count}", end='\r')
+        f.write(bytearray(encoder.EndEncode()))
+    print()
+
+
+# PyNvVideoCodec 경로가 처리할 수 있는 입력 (8비트 4:2:0 H.264/HEVC)
+PYNVC_CODECS = ('h264', 'hevc')
+PYNVC_PIX_FMTS = ('yuv420p', 'yuvj420p', 'nv12')
+
+
+def _pynvc_frame_rate(src):
+    """PyNvVideoCodec으로 처리할 수 있는 원본이면 고정 프레임 레이트(예: '30000/1001')를 반환하고, 아니면 ValueError를 발생시킵니다.
+
+    엘리멘터리 스트림에는 타임스탬프가 없어 다시 합칠 때 고정 프레임 레이트로 새로 매기므로,
+    가변 프레임 레이트(VFR) 원본은 오디오 싱크가 어긋나지 않도록 FFmpeg 경로로 보냅니다.
+    """
+    video = next(s for s in ffmpeg.probe(src)['streams'] if s['codec_type'] == 'video')
+    if video['codec_name'] not in PYNVC_CODECS or video.get('pix_fmt') not in PYNVC_PIX_FMTS:
+        raise ValueError(f"PyNvVideoCodec 미지원 입력 ({video['codec_name']}, {video.get('pix_fmt')})")
+    if video['r_frame_rate'] != video['avg_frame_rate']:
+        raise ValueError(f"가변 프레임 레이트 입력 ({video['r_frame_rate']} != {video['avg_frame_rate']})")
+    return video['r_frame_rate']
+
+
+async def transcode_pynvc(src, dst, bitrate):
+    """PyNvVideoCodec으로 영상 스트림을 변환한 뒤, FFmpeg으로 원본 오디오와 합칩니다."""
+    frame_rate = await asyncio.to_thread(_pynvc_frame_rate, src)
+    elementary_path = f"{dst}.h264"
+    try:
+        # 프레임 루프는 블로킹 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        await asyncio.to_thread(_encode_pynvc, src, elementary_path, bitrate)
+
+        # 영상은 NVENC 결과물, 오디오는 원본을 그대로 복사해서 컨테이너만 다시 만듭니다.
+        # 원본의 정확한 프레임 레이트(유리수)로 타임스탬프를 매겨 오디오와 길이를 맞춥니다.
+        video = ffmpeg.input(elementary_path, format='h264', framerate=frame_rate)
+        audio = ffmpeg.input(src)['a?']
+        process = (
+            ffmpeg
+            .output(video, audio, dst, vcodec='copy', acodec='copy', movflags='+faststart')
+            .overwrite_output()
+        )
+        await run_ffmpeg_with_progress(process, os.path.basename(src))
+    finally:
+        if os.path.exists(elementary_path):
+            os.remove(elementary_path)
+
+
+def _uses_pynvc():
+    # 크기 조정/필터가 설정된 경우에는 FFmpeg 필터 그래프가 필요하므로 항상 FFmpeg을 사용합니다.
+    return nvc is not None and not (OUTPUT_SIZE or CPU_FILTERS)
+
+
+def _batch_size():
+    """실제로 한 번에 묶을 파일 수. NVENC 사용 시 동시에 열리는 세션 수가 MAX_NVENC_SESSIONS를 넘지 않게 합니다."""
+    if _uses_pynvc():
+        # PyNvVideoCodec 경로는 파일별로 처리하므로 묶지 않습니다.
+        return 1
+    if _nvenc_available():
+        return max(1, min(TRANSCODE_BATCH_SIZE, MAX_NVENC_SESSIONS // MAX_CONCURRENT_TRANSCODES))
+    return TRANSCODE_BATCH_SIZE
+
+
+async def transcode(jobs):
+    """PyNvVideoCodec이 설치되어 있으면 사용하고, 아니면 FFmpeg 한 번으로 묶어서 변환합니다."""
+    if _uses_pynvc():
+        # 한 파이썬 프로세스 안에서 CUDA 컨텍스트를 공유하므로 파일별로 처리해도 됩니다.
+        for src, dst in jobs:
+            try:
+                await transcode_pynvc(src, dst, TARGET_BITRATE)
+            except ValueError as e:
+                # ProRes, 10비트, 4:2:2, VFR 등 PyNvVideoCodec이 처리하지 못하는 입력만 FFmpeg으로 다시 변환합니다.
+                # 인코더/드라이버 오류는 설치 문제이므로 그대로 실패시킵니다 (사전 테스트에서 걸러집니다).
+                print(f" -> PyNvVideoCodec 변환 실패, FFmpeg으로 다시 시도합니다: {os.path.basename(src)} ({e})")
+                await transcode_ffmpeg([(src, dst)])
+    else:
+        await transcode_ffmpeg(jobs)
+
+
+async def transcode_ffmpeg(jobs):
+    """FFmpeg 한 번으로 묶어서 변환합니다. 파일 하나의 NVENC 변환이 실패하면 libx264로 한 번 더 시도합니다."""
+    label = ', '.join(os.path.basename(src) for src, _ in jobs)
+    try:
+        await run_ffmpeg_with_progress(build_transcode(jobs), label)
+    except ffmpeg.Error as e:
+        # 묶음 실패는 transcode_batch가 파일별로 다시 나눠서 호출하므로, 여기서는 파일 하나일 때만 재시도합니다.
+        if len(jobs) > 1 or not _nvenc_available():
+            raise
+        # 10비트(HEVC Main10)/4:2:2(ProRes) 원본이나 GPU/드라이버 문제로 NVENC가 실패하는 경우입니다.
+        _print_transcode_error(e, label)
+        print(f" -> NVENC 변환 실패, libx264로 다시 시도합니다: {label}")
+        await run_ffmpeg_with_progress(build_transcode(jobs, use_nvenc=False), label)
+
+
+def _encoder_name():
+    if _uses_pynvc():
+        return 'PyNvVideoCodec (GPU)'
+    return 'h264_nvenc (GPU)' if _nvenc_available() else 'libx264 (CPU)'
+
+
+def _selftest_fingerprint():
+    """사전 테스트 결과가 유효한 환경을 나타내는 문자열 (인코더, FFmpeg 실행 파일 경로와 수정 시각)."""
+    ffmpeg_path = os.path.realpath(shutil.which(FFMPEG_PATH) or FFMPEG_PATH)
+    try:
+        ffmpeg_mtime = os.path.getmtime(ffmpeg_path)
+    except OSError:
+        ffmpeg_mtime = None
+    return f"{_encoder_name()}\n{FFMPEG_PATH}\n{ffmpeg_path}\n{ffmpeg_mtime}\n"
+
+
+def selftest_passed_recently():
+    """최근 SELFTEST_CACHE_SECONDS 이내에 같은 인코더/FFmpeg로 사전 테스트를 통과한 기록이 있는지 확인합니다."""
+    try:
+        if time.time() - os.path.getmtime(SELFTEST_CACHE_FILE) >= SELFTEST_CACHE_SECONDS:
+            return False
+        with open(SELFTEST_CACHE_FILE) as f:
+            return f.read() == _selftest_fingerprint()
+    except OSError:
+        return False
+
+
+def run_selftest():
+    """실제 실행 전에 로컬 사전 테스트를 실행합니다. --skip-selftest 옵션이나 최근 통과 기록이 있으면 건너뜁니다."""
+    if '--skip-selftest' in sys.argv[1:]:
+        print("== [안내] --skip-selftest 옵션으로 로컬 사전 테스트를 건너뜁니다. ==")
+        return True
+    if selftest_passed_recently():
+        print(f"== [안내] 최근 사전 테스트 통과 기록('{SELFTEST_CACHE_FILE}')이 있어 테스트를 건너뜁니다. ==")
+        return True
+
+    if not test_local_transcoding():
+        return False
+    with open(SELFTEST_CACHE_FILE, 'w') as f:
+        f.write(_selftest_fingerprint())
+    return True
+
+
 def test_local_transcoding():
     """로컬 파일로 FFmpeg 변환을 테스트하고 진행률을 보여줍니다."""
     print("="*70)
     print(f"1. 로컬 FFmpeg 사전 테스트를 시작합니다 (대상: '{LOCAL_TEST_FILE}')...")
+    print(f"   인코더: {_encoder_name()}")
     output_file = f"test_output_{os.path.basename(LOCAL_TEST_FILE)}"
 
     if not os.path.exists(LOCAL_TEST_FILE):
@@ -63,14 +377,11 @@ def test_local_transcoding():
         return False
 
     try:
-        process = (
-            ffmpeg
-            .input(LOCAL_TEST_FILE)
-            .output(output_file, video_bitrate=TARGET_BITRATE, acodec='copy')
-            .global_args('-progress', 'pipe:2') # 진행률 출력을 stderr로 보냄
-            .overwrite_output()
-        )
-        run_ffmpeg_with_progress(process)
+        if _uses_pynvc():
+            # FFmpeg 재시도 없이 PyNvVideoCodec 경로 자체를 검증합니다.
+            asyncio.run(transcode_pynvc(LOCAL_TEST_FILE, output_file, TARGET_BITRATE))
+        else:
+            asyncio.run(transcode([(LOCAL_TEST_FILE, output_file)]))
         print(f"   [성공] 로컬 테스트 통과. FFmpeg가 정상적으로 작동합니다.")
         return True
     except ffmpeg.Error as e:
@@ -78,83 +389,489 @@ def test_local_transcoding():
         print("   --- FFmpeg 상세 오류 ---", file=sys.stderr)
         print(e.stderr, file=sys.stderr)
         return False
+    except Exception as e:
+        print(f"\n   [실패] 로컬 테스트 중 오류가 발생했습니다: {e}", file=sys.stderr)
+        return False
     finally:
         if os.path.exists(output_file):
             os.remove(output_file)
 
-def process_videos_in_folder(folder_name):
-    """S3 폴더의 동영상을 변환하며 진행률을 보여줍니다."""
-    s3_client = boto3.client('s3')
+
+# 파이프라인에서 처리 중인 파일들이 /dev/shm에 예약해 둔 바이트 수
+# (DASH 변환은 스레드에서 예약하므로 잠금으로 보호합니다.)
+_shm_reserved_bytes = 0
+_shm_reserved_lock = threading.Lock()
+
+
+def _reserve_scratch(size):
+    """임시 파일을 둘 디렉터리를 고르고 (디렉터리, 예약한 바이트 수)를 반환합니다.
+
+    원본과 변환 결과(약 size의 2배)가 들어갈 여유가 있으면 RAM 기반의 /dev/shm을, 아니면 /tmp를 사용합니다.
+    아직 결과 파일이 만들어지지 않은 처리 중인 파일들도 있으므로, 남은 공간에서 그 예약분을 빼고 판단합니다.
+    예약분은 파일을 정리할 때 _release_scratch()로 돌려줍니다.
+    """
+    global _shm_reserved_bytes
+    needed = 2 * size
+    with _shm_reserved_lock:
+        if os.path.isdir('/dev/shm') and shutil.disk_usage('/dev/shm').free - _shm_reserved_bytes > needed:
+            _shm_reserved_bytes += needed
+            return '/dev/shm', needed
+    return '/tmp', 0
+
+
+def _release_scratch(reserved):
+    global _shm_reserved_bytes
+    with _shm_reserved_lock:
+        _shm_reserved_bytes -= reserved
+
+
+def _local_path(key, prefix='', directory='/tmp'):
+    """S3 키로부터 겹치지 않는 임시 파일 경로를 만듭니다 (여러 폴더를 동시에 처리하므로)."""
+    return f"{directory}/{prefix}{key.replace('/', '_')}"
+
+
+def _metadata_key(key):
+    return f"{key}.meta"
+
+
+def probe_metadata(source, size):
+    """영상의 비트레이트/길이를 확인합니다. 헤더 분석에 필요한 만큼만 읽도록 프로브 범위를 제한합니다."""
+    probe_kwargs = dict(probesize='1M', analyzeduration='1M')
+    if source.startswith('https://'):
+        # 응답이 멈춘 CloudFront/S3 연결에서 오래 기다리지 않도록 읽기 타임아웃(5초)을 둡니다.
+        probe_kwargs['rw_timeout'] = 5000000
+    probe = ffmpeg.probe(source, **probe_kwargs)
+    video_stream = next((s for s in probe['streams'] if s['codec_type'] == 'video'), None)
+    if not video_stream or 'bit_rate' not in video_stream:
+        return None
+    return {
+        'bit_rate': int(video_stream['bit_rate']),
+        'duration': float(probe['format'].get('duration', 0)),
+        'size': size,
+    }
+
+
+def read_metadata(s3_client, key, size):
+    """S3의 사이드카(<key>.meta)에서 메타데이터를 읽습니다. 없거나 객체 크기가 달라졌으면 None을 반환합니다."""
+    try:
+        response = s3_client.get_object(Bucket=BUCKET_NAME, Key=_metadata_key(key))
+        metadata = json.loads(response['Body'].read())
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    except Exception as e:
+        print(f" -> [경고] 메타데이터 읽기 실패: {key} ({e})", file=sys.stderr)
+        return None
+    # 객체가 교체되었으면 크기가 달라지므로 이전 메타데이터는 사용하지 않습니다.
+    if metadata.get('size') != size:
+        return None
+    return metadata
+
+
+def write_metadata(s3_client, key, metadata):
+    s3_client.put_object(Bucket=BUCKET_NAME, Key=_metadata_key(key), Body=json.dumps(metadata).encode('utf-8'),
+                         ContentType='application/json')
+
+
+def load_metadata(s3_client, obj):
+    """객체의 메타데이터를 가져옵니다. 확인할 수 없으면 None을 반환합니다."""
+    key = obj['Key']
+    # 사이드카 메타데이터가 있으면 GET 한 번으로 끝내고, 없을 때만 CloudFront로 프로브합니다.
+    metadata = read_metadata(s3_client, key, obj['Size'])
+    if metadata is not None:
+        return metadata
+
+    try:
+        metadata = probe_metadata(f"https://{CLOUDFRON_DOMAIN}/{key}", obj['Size'])
+    except Exception:
+        return None
+    if metadata is not None and not DRY_RUN:
+        try:
+            write_metadata(s3_client, key, metadata)
+        except Exception as e:
+            print(f" -> [경고] 메타데이터 저장 실패: {key} ({e})", file=sys.stderr)
+    return metadata
+
+
+def find_target_keys(s3_client, folder_name):
+    """폴더의 동영상 비트레이트를 확인하여 변환이 필요한 (키, 크기) 목록을 반환합니다.
+
+    목록을 먼저 모두 조회한 뒤, 파일별 메타데이터 확인은 PROBE_EXECUTOR에서 동시에 실행합니다.
+    """
     paginator = s3_client.get_paginator('list_objects_v2')
     full_folder_path = f"{PREFIX_TO_SCAN}{folder_name}/"
 
-    print("\n" + "="*70)
+    video_objects = []
+    pages = paginator.paginate(Bucket=BUCKET_NAME, Prefix=full_folder_path)
+    for page in pages:
+        # DASH 출력(<원본>/dash/init-*.mp4 등)은 변환 대상이 아니므로 제외합니다.
+        video_objects += [obj for obj in page.get('Contents', [])
+                          if obj['Key'].lower().endswith(('.mov', '.mp4')) and '/dash/' not in obj['Key']]
+
+    all_metadata = list(PROBE_EXECUTOR.map(lambda obj: load_metadata(s3_client, obj), video_objects))
+
+    target_keys = []
+    for obj, metadata in zip(video_objects, all_metadata):
+        if metadata is None: continue
+        key = obj['Key']
+        current_bitrate = metadata['bit_rate']
+
+        print(f"[대상 파일] s3://{BUCKET_NAME}/{key} -> 비트레이트: {current_bitrate / 1000000:.2f} Mbps")
+        if DASH_OUTPUT and metadata.get('dash_manifest'):
+            print(f" -> 이미 DASH로 변환된 파일입니다 ({metadata['dash_manifest']}). 작업을 건너뜁니다.")
+        elif current_bitrate > BITRATE_THRESHOLD:
+            print(f" -> 기준치 초과. 변환 대상에 추가합니다.")
+            target_keys.append((key, obj['Size']))
+        else:
+            print(" -> 기준치 이하. 작업을 건너뜁니다.")
+    return target_keys
+
+
+def _remove_files(*paths):
+    for path in paths:
+        if os.path.exists(path): os.remove(path)
+
+
+async def download_worker(s3_client, to_download, to_transcode):
+    """키를 받아 다운로드한 뒤 변환 큐로 넘깁니다. 큐가 가득 차면 다음 다운로드를 멈춥니다."""
+    while True:
+        item = await to_download.get()
+        if item is None:
+            break
+
+        key, size = item
+        scratch_dir, reserved = _reserve_scratch(size)
+        download_path = _local_path(key, directory=scratch_dir)
+        print(f" -> S3에서 다운로드 중... ({key})")
+        try:
+            await asyncio.to_thread(s3_client.download_file, BUCKET_NAME, key, download_path,
+                                    Config=TRANSFER_CONFIG)
+        except Exception as e:
+            print(f"\n -> [오류] 다운로드 실패: {key} ({e})", file=sys.stderr)
+            _remove_files(download_path)
+            _release_scratch(reserved)
+            continue
+        await to_transcode.put((key, download_path, _local_path(key, 'transcoded_', scratch_dir), reserved))
+
+    for _ in range(MAX_CONCURRENT_TRANSCODES):
+        await to_transcode.put(None)
+
+
+def _print_transcode_error(e, target):
+    if isinstance(e, ffmpeg.Error):
+        print(f"\n -> [오류] FFmpeg 변환 실패: {target}", file=sys.stderr)
+        print(e.stderr, file=sys.stderr)
+    else:
+        print(f"\n -> [오류] 파일 처리 중 실패: {target} ({e})", file=sys.stderr)
+
+
+async def transcode_batch(batch):
+    """묶음을 변환하고 성공한 항목 목록을 반환합니다.
+
+    한 FFmpeg 프로세스에서 한 파일이라도 실패하면 묶음 전체가 실패하므로, 이때는 파일별로 다시 변환합니다.
+    """
+    if len(batch) > 1:
+        try:
+            await transcode([(download_path, transcoded_path) for _, download_path, transcoded_path, _ in batch])
+            return batch
+        except Exception as e:
+            _print_transcode_error(e, f"{len(batch)}개 파일 묶음")
+            print(" -> 묶음 변환에 실패하여 파일별로 다시 시도합니다.")
+            for _, _, transcoded_path, _ in batch:
+                _remove_files(transcoded_path)
+
+    succeeded = []
+    for item in batch:
+        key, download_path, transcoded_path, reserved = item
+        try:
+            await transcode([(download_path, transcoded_path)])
+            succeeded.append(item)
+        except Exception as e:
+            _print_transcode_error(e, key)
+            _remove_files(transcoded_path)
+            _release_scratch(reserved)
+    return succeeded
+
+
+async def transcode_worker(to_transcode, to_upload):
+    """다운로드된 파일을 대기 중인 만큼(최대 _batch_size()개) 묶어서 변환하고 업로드 큐로 넘깁니다."""
+    batch_size = _batch_size()
+    finished = False
+    while not finished:
+        item = await to_transcode.get()
+        if item is None:
+            break
+
+        batch = [item]
+        while len(batch) < batch_size and not to_transcode.empty():
+            item = to_transcode.get_nowait()
+            if item is None:
+                finished = True
+                break
+            batch.append(item)
+
+        print(f"[일괄 변환] {len(batch)}개 파일을 트랜스코딩 중...")
+        try:
+            succeeded = await transcode_batch(batch)
+        finally:
+            for _, download_path, _, _ in batch:
+                _remove_files(download_path)
+
+        for key, _, transcoded_path, reserved in succeeded:
+            await to_upload.put((key, transcoded_path, reserved))
+
+
+async def upload_worker(s3_client, to_upload):
+    """변환된 파일을 S3에 업로드하고 임시 파일을 정리합니다."""
+    while True:
+        item = await to_upload.get()
+        if item is None:
+            break
+
+        key, transcoded_path, reserved = item
+        print(f" -> S3로 업로드 중... ({key})")
+        try:
+            await asyncio.to_thread(s3_client.upload_file, transcoded_path, BUCKET_NAME, key,
+                                    Config=TRANSFER_CONFIG)
+            print(f" -> [성공] 작업이 완료되었습니다. ({key})")
+            # 다음 실행에서 다시 프로브하지 않도록 변환 결과의 메타데이터를 저장합니다.
+            try:
+                metadata = await asyncio.to_thread(probe_metadata, transcoded_path, os.path.getsize(transcoded_path))
+                if metadata is not None:
+                    await asyncio.to_thread(write_metadata, s3_client, key, metadata)
+            except Exception as e:
+                print(f" -> [경고] 메타데이터 저장 실패: {key} ({e})", file=sys.stderr)
+        except Exception as e:
+            print(f"\n -> [오류] 업로드 실패: {key} ({e})", file=sys.stderr)
+        finally:
+            _remove_files(transcoded_path)
+            _release_scratch(reserved)
+
+
+class _CheckedPipe:
+    """FFmpeg stdout을 감싸서, 스트림 끝에서 FFmpeg이 실패했으면 예외를 던집니다.
+
+    upload_fileobj가 예외를 받으면 멀티파트 업로드를 중단하므로 잘린 파일이 원본을 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, process, stderr_lines):
+        self.process = process
+        self.stderr_lines = stderr_lines
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.process.stdout.read(size)
+        self.bytes_read += len(data)
+        if not data and self.process.wait() != 0:
+            raise ffmpeg.Error('ffmpeg', None, '\n'.join(self.stderr_lines))
+        return data
+
+
+def _drain_stderr(process):
+    """stderr 파이프가 가득 차서 FFmpeg이 멈추지 않도록 별도 스레드에서 계속 읽어 둡니다."""
+    stderr_lines = deque(maxlen=50)
+    def drain():
+        for line in process.stderr:
+            stderr_lines.append(line.decode('utf-8', errors='replace').rstrip())
+    drainer = threading.Thread(target=drain, daemon=True)
+    drainer.start()
+    return drainer, stderr_lines
+
+
+def _presigned_source_url(s3_client, key):
+    # MOV/MP4는 moov 박스가 파일 끝에 있을 수 있어 stdin 파이프로는 읽을 수 없습니다.
+    # 대신 presigned URL을 넘겨서 FFmpeg이 HTTP Range 요청으로 필요한 부분만 읽도록 합니다.
+    return s3_client.generate_presigned_url(
+        'get_object', Params={'Bucket': BUCKET_NAME, 'Key': key}, ExpiresIn=6 * 3600
+    )
+
+
+def stream_transcode(s3_client, key, use_nvenc=True):
+    """S3 객체를 로컬 디스크에 저장하지 않고 FFmpeg으로 변환해서 같은 키로 바로 업로드합니다."""
+    source_url = _presigned_source_url(s3_client, key)
+    process = (
+        _transcode_output(source_url, 'pipe:1', use_nvenc, format='mp4', movflags='frag_keyframe+empty_moov')
+        .global_args('-nostdin', '-nostats', '-loglevel', 'error')
+        .run_async(cmd=FFMPEG_PATH, pipe_stdout=True, pipe_stderr=True)
+    )
+
+    drainer, stderr_lines = _drain_stderr(process)
+
+    pipe = _CheckedPipe(process, stderr_lines)
+    try:
+        s3_client.upload_fileobj(pipe, BUCKET_NAME, key, Config=TRANSFER_CONFIG)
+    finally:
+        process.kill()
+        process.wait()
+        drainer.join()
+
+    # 로컬 결과 파일이 없으므로 업로드된 객체를 다시 프로브해서 메타데이터를 저장합니다.
+    try:
+        metadata = probe_metadata(source_url, pipe.bytes_read)
+        if metadata is not None:
+            write_metadata(s3_client, key, metadata)
+    except Exception as e:
+        print(f" -> [경고] 메타데이터 저장 실패: {key} ({e})", file=sys.stderr)
+
+
+def dash_prefix(key):
+    return f"{os.path.splitext(key)[0]}/dash/"
+
+
+def _upload_dash_files(s3_client, output_dir, names, prefix, uploaded):
+    for name in sorted(names):
+        if name in uploaded:
+            continue
+        path = os.path.join(output_dir, name)
+        s3_client.upload_file(path, BUCKET_NAME, prefix + name, Config=TRANSFER_CONFIG)
+        uploaded.add(name)
+        os.remove(path)
+
+
+def dash_transcode(s3_client, key, size, use_nvenc=True):
+    """원본을 DASH 세그먼트로 변환하면서, 완성된 세그먼트를 바로바로 S3에 업로드합니다."""
+    source_url = _presigned_source_url(s3_client, key)
+    # 세그먼트는 업로드 즉시 지우지만, 업로드가 인코딩보다 느리면 쌓일 수 있으므로 원본 크기만큼 자리를 예약합니다.
+    scratch_dir, reserved = _reserve_scratch(size)
+    output_dir = _local_path(key, 'dash_', scratch_dir)
+    prefix = dash_prefix(key)
+    try:
+        _dash_transcode_to(s3_client, source_url, output_dir, prefix, use_nvenc)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        _release_scratch(reserved)
+
+    # 원본은 바뀌지 않으므로, 다음 실행에서 다시 변환하지 않도록 원본의 메타데이터에 매니페스트 위치를 남깁니다.
+    try:
+        metadata = probe_metadata(source_url, size)
+        if metadata is not None:
+            metadata['dash_manifest'] = prefix + 'manifest.mpd'
+            write_metadata(s3_client, key, metadata)
+    except Exception as e:
+        print(f" -> [경고] 메타데이터 저장 실패: {key} ({e})", file=sys.stderr)
+
+
+def _dash_transcode_to(s3_client, source_url, output_dir, prefix, use_nvenc):
+    os.makedirs(output_dir, exist_ok=True)
+    process = (
+        _transcode_output(
+            source_url, os.path.join(output_dir, 'manifest.mpd'), use_nvenc, format='dash', movflags=None,
+            seg_duration=DASH_SEGMENT_SECONDS, use_template=1, use_timeline=1,
+            init_seg_name='init-$RepresentationID$.mp4',
+            media_seg_name='chunk-$RepresentationID$-$Number%05d$.m4s',
+        )
+        .global_args('-nostdin', '-nostats', '-loglevel', 'error')
+        .run_async(cmd=FFMPEG_PATH, pipe_stderr=True)
+    )
+    drainer, stderr_lines = _drain_stderr(process)
+
+    uploaded = set()
+    try:
+        # DASH 먹서는 세그먼트를 '.tmp'로 쓰다가 완성되면 이름을 바꾸므로, '.m4s' 파일은 모두 완성된 세그먼트입니다.
+        while process.poll() is None:
+            segments = [name for name in os.listdir(output_dir) if name.endswith('.m4s')]
+            _upload_dash_files(s3_client, output_dir, segments, prefix, uploaded)
+            time.sleep(1)
+
+        drainer.join()
+        if process.returncode != 0:
+            raise ffmpeg.Error('ffmpeg', None, '\n'.join(stderr_lines))
+
+        # 남은 세그먼트와 초기화 세그먼트를 올린 뒤, 마지막으로 매니페스트를 올려서 마무리합니다.
+        names = [name for name in os.listdir(output_dir) if not name.endswith(('.tmp', '.mpd'))]
+        _upload_dash_files(s3_client, output_dir, names, prefix, uploaded)
+        _upload_dash_files(s3_client, output_dir, ['manifest.mpd'], prefix, uploaded)
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+async def stream_worker(s3_client, to_download):
+    """STREAM_IO/DASH_OUTPUT 모드에서 키를 받아 로컬 원본 파일 없이 변환합니다."""
+    while True:
+        item = await to_download.get()
+        if item is None:
+            break
+
+        key, size = item
+        print(f" -> 스트리밍 변환 중... ({key})")
+        if DASH_OUTPUT:
+            stream_func, args = dash_transcode, (s3_client, key, size)
+        else:
+            stream_func, args = stream_transcode, (s3_client, key)
+        try:
+            try:
+                await asyncio.to_thread(stream_func, *args)
+            except ffmpeg.Error as e:
+                if not _nvenc_available():
+                    raise
+                # 업로드가 완료되기 전에 실패하면 원본 객체는 그대로이므로 libx264로 다시 변환합니다.
+                _print_transcode_error(e, key)
+                print(f" -> NVENC 변환 실패, libx264로 다시 시도합니다: {key}")
+                await asyncio.to_thread(stream_func, *args, False)
+            print(f" -> [성공] 작업이 완료되었습니다. ({key})")
+        except ffmpeg.Error as e:
+            print(f"\n -> [오류] FFmpeg 변환 실패: {key}", file=sys.stderr)
+            print(e.stderr, file=sys.stderr)
+        except Exception as e:
+            print(f"\n -> [오류] 파일 처리 중 실패: {key} ({e})", file=sys.stderr)
+
+
+async def process_videos_in_folder(s3_client, folder_name, to_download):
+    """S3 폴더에서 변환 대상을 찾아 다운로드 큐에 넣습니다."""
+    full_folder_path = f"{PREFIX_TO_SCAN}{folder_name}/"
+
     print(f"== '{full_folder_path}' 폴더의 작업을 시작합니다. ==")
 
     try:
-        pages = paginator.paginate(Bucket=BUCKET_NAME, Prefix=full_folder_path)
-        # ... (이하 파일 목록 조회 및 비트레이트 확인 로직은 동일)
-        for page in pages:
-            if 'Contents' not in page: continue
-            for obj in page['Contents']:
-                # ...
-                if not obj['Key'].lower().endswith(('.mov', '.mp4')): continue
-                key = obj['Key']
-                print("-" * 50)
-                print(f"[대상 파일] s3://{BUCKET_NAME}/{key}")
-
-                # ... (비트레이트 확인 로직)
-                current_bitrate = 0 # 임시
-                try:
-                    cloudfront_url = f"https://{CLOUDFRON_DOMAIN}/{key}"
-                    probe = ffmpeg.probe(cloudfront_url)
-                    video_stream = next((s for s in probe['streams'] if s['codec_type'] == 'video'), None)
-                    if not video_stream or 'bit_rate' not in video_stream: continue
-                    current_bitrate = int(video_stream['bit_rate'])
-                    print(f" -> 비트레이트: {current_bitrate / 1000000:.2f} Mbps")
-                except Exception: continue
-
-                if current_bitrate > BITRATE_THRESHOLD:
-                    print(f" -> 기준치 초과. 변환을 시작합니다.")
-                    if DRY_RUN:
-                        print(" -> [Dry Run] 실제 변환/업로드는 건너뜁니다.")
-                        continue
-
-                    download_path = f"/tmp/{os.path.basename(key)}"
-                    transcoded_path = f"/tmp/transcoded_{os.path.basename(key)}"
-
-                    try:
-                        print(" -> S3에서 다운로드 중...")
-                        s3_client.download_file(BUCKET_NAME, key, download_path)
-                        print(" -> FFmpeg으로 트랜스코딩 중...")
-
-                        process = (
-                            ffmpeg
-                            .input(download_path)
-                            .output(transcoded_path, video_bitrate=TARGET_BITRATE, acodec='copy')
-                            .global_args('-progress', 'pipe:2')
-                            .overwrite_output()
-                        )
-                        run_ffmpeg_with_progress(process)
-
-                        print(" -> S3로 업로드 중...")
-                        s3_client.upload_file(transcoded_path, BUCKET_NAME, key)
-                        print(" -> [성공] 작업이 완료되었습니다.")
-                    except ffmpeg.Error as e:
-                        print(f"\n -> [오류] FFmpeg 변환 실패:", file=sys.stderr)
-                        print(e.stderr, file=sys.stderr)
-                    except Exception as e:
-                        print(f"\n -> [오류] 파일 처리 중 실패: {e}", file=sys.stderr)
-                    finally:
-                        if os.path.exists(download_path): os.remove(download_path)
-                        if os.path.exists(transcoded_path): os.remove(transcoded_path)
-                else:
-                    print(" -> 기준치 이하. 작업을 건너뜁니다.")
+        # 목록 조회와 비트레이트 확인은 스레드에서 실행해서 다른 폴더의 변환과 겹치게 합니다.
+        target_keys = await asyncio.to_thread(find_target_keys, s3_client, folder_name)
+        if DRY_RUN:
+            print(f" -> [Dry Run] '{full_folder_path}' 변환 대상 {len(target_keys)}개의 실제 변환/업로드는 건너뜁니다.")
+            return
+
+        for item in target_keys:
+            await to_download.put(item)
     except Exception as e:
         print(f"\n[치명적 오류] '{full_folder_path}' 처리 중 문제가 발생했습니다: {e}", file=sys.stderr)
 
+
+async def process_all_folders(folders):
+    """다운로드 → 변환 → 업로드를 각각의 워커로 나눠, 세 단계가 서로 겹쳐서 진행되도록 합니다."""
+    s3_client = S3_CLIENT
+    to_download = asyncio.Queue()
+    # 소스 코드에 입력한 한글 폴더 이름이 NFD면 목록 조회 결과가 아무 경고 없이 비게 되므로 NFC로 맞춥니다.
+    folders = [unicodedata.normalize('NFC', folder) for folder in folders]
+
+    if STREAM_IO or DASH_OUTPUT:
+        streamers = [asyncio.create_task(stream_worker(s3_client, to_download))
+                     for _ in range(MAX_CONCURRENT_TRANSCODES)]
+        await asyncio.gather(*(process_videos_in_folder(s3_client, folder, to_download) for folder in folders))
+        for _ in streamers:
+            await to_download.put(None)
+        await asyncio.gather(*streamers)
+        return
+
+    to_transcode = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    to_upload = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    downloader = asyncio.create_task(download_worker(s3_client, to_download, to_transcode))
+    transcoders = [asyncio.create_task(transcode_worker(to_transcode, to_upload))
+                   for _ in range(MAX_CONCURRENT_TRANSCODES)]
+    uploader = asyncio.create_task(upload_worker(s3_client, to_upload))
+
+    await asyncio.gather(*(process_videos_in_folder(s3_client, folder, to_download) for folder in folders))
+
+    # 각 단계가 끝나면 다음 단계에 종료 신호(None)를 보냅니다.
+    await to_download.put(None)
+    await downloader
+    await asyncio.gather(*transcoders)
+    await to_upload.put(None)
+    await uploader
+
 if __name__ == '__main__':
-    if not DRY_RUN or test_local_transcoding():
+    # 사전 테스트는 실제로 S3 파일을 변환하는 모드에서만 실행합니다 (DRY RUN은 빠르게 목록만 확인).
+    if DRY_RUN or run_selftest():
         # ... (이하 실행 로직은 동일)
         print("\n" + "="*70)
         print("2. S3 동영상 변환 작업을 시작합니다.")
@@ -162,8 +879,7 @@ if __name__ == '__main__':
         else: print("== [경고] S3 작업은 실제 실행 모드입니다. ==")
 
         print(f"총 {len(folders_to_process)}개의 폴더를 대상으로 작업을 시작합니다.")
-        for folder in folders_to_process:
-            process_videos_in_folder(folder)
+        asyncio.run(process_all_folders(folders_to_process))
 
         print("\n" + "="*70)
-        print("모든 지정된 작업이 종료되었습니다.")
\ No newline at end of file
+        print("모든 지정된 작업이 종료되었습니다.")
@@ -1,5 +1,9 @@
 import boto3
+import queue
 import unicodedata
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # ------------------- 설정 -------------------
 # 작업을 수행할 S3 버킷 이름을 입력하세요.
@@ -12,12 +16,112 @@ PREFIX_TO_SCAN = 'lectures/'
 # True로 설정하면 삭제 대상 파일만 출력하고 실제 삭제는 하지 않습니다.
 # 삭제 대상 목록을 충분히 확인한 후, False로 변경하여 실제 삭제를 진행하세요.
 DRY_RUN = False
+
+# delete_objects 한 번에 삭제할 수 있는 최대 키 개수 (S3 제한)
+DELETE_BATCH_SIZE = 1000
+
+# 하위 폴더별로 동시에 목록을 조회할 스레드 수
+MAX_WORKERS = 16
 # -------------------------------------------
 
+# 여러 스레드가 하나의 클라이언트를 공유하므로 연결 풀을 스레드 수보다 넉넉하게 잡습니다.
+S3_CLIENT = boto3.client('s3', config=Config(
+    max_pool_connections=64,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True,
+))
+
+
+def delete_keys(s3, keys):
+    """여러 키를 delete_objects로 한 번에 삭제하고, 삭제에 성공한 개수를 반환합니다."""
+    try:
+        response = s3.delete_objects(
+            Bucket=BUCKET_NAME,
+            Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True},
+        )
+    except Exception as e:
+        print(f"  -> [삭제 실패] {len(keys)}개 파일 일괄 삭제 중 오류 발생: {e}")
+        return 0
+
+    # Quiet 모드에서는 실패한 키만 응답에 포함됩니다.
+    errors = response.get('Errors', [])
+    for error in errors:
+        print(f"  -> [삭제 실패] '{error['Key']}': {error.get('Message', error.get('Code'))}")
+    print(f"  -> [삭제 완료] {len(keys) - len(errors)}개 파일이 성공적으로 삭제되었습니다.")
+    return len(keys) - len(errors)
+
+
+def delete_writer(s3, delete_queue):
+    """큐로 전달된 키를 모아서 일괄 삭제합니다. None을 받으면 남은 키를 삭제하고 종료합니다."""
+    deleted_count = 0
+    pending_keys = []
+
+    while True:
+        key = delete_queue.get()
+        if key is None:
+            break
+        pending_keys.append(key)
+        if len(pending_keys) >= DELETE_BATCH_SIZE:
+            deleted_count += delete_keys(s3, pending_keys)
+            pending_keys = []
+
+    if pending_keys:
+        deleted_count += delete_keys(s3, pending_keys)
+    return deleted_count
+
+
+@lru_cache(maxsize=100_000)
+def _is_nfc_prefix(prefix):
+    return unicodedata.is_normalized('NFC', prefix)
+
+
+def is_nfd_key(key):
+    """키가 NFC 형식이 아닌지 확인합니다.
+
+    같은 폴더의 키들은 폴더 경로가 반복되므로, 폴더 부분의 결과는 캐시하고 파일 이름만 새로 검사합니다.
+    ('/'는 다른 문자와 결합하지 않으므로 둘로 나눠 검사해도 결과가 같습니다.)
+    """
+    # ASCII로만 이루어진 키는 NFD일 수 없으므로 검사를 건너뜁니다.
+    if key.isascii():
+        return False
+
+    prefix, _, name = key.rpartition('/')
+    return not (_is_nfc_prefix(prefix) and unicodedata.is_normalized('NFC', name))
+
+
+def check_key(key, delete_queue):
+    """키가 NFD 형식이면 출력하고 삭제 큐에 넣습니다. NFD 여부를 반환합니다."""
+    if not is_nfd_key(key):
+        return False
+
+    print(f"\n[NFD 파일 발견] '{key}'")
+    if not DRY_RUN:
+        delete_queue.put(key)
+    else:
+        print(f"  -> [Dry Run] 실제 삭제를 건너뜁니다. (NFC 변환 시: '{unicodedata.normalize('NFC', key)}')")
+    return True
+
+
+def scan_prefix(s3, prefix, delete_queue):
+    """prefix 아래의 모든 객체를 검사하고, 찾은 NFD 파일 개수를 반환합니다."""
+    paginator = s3.get_paginator('list_objects_v2')
+    found_count = 0
+
+    for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            if check_key(obj['Key'], delete_queue):
+                found_count += 1
+    return found_count
+
+
 def find_and_delete_nfd_files():
-    """S3 버킷의 특정 prefix에서 NFD 형식의 키를 가진 객체를 찾아 삭제합니다."""
+    """S3 버킷의 특정 prefix에서 NFD 형식의 키를 가진 객체를 찾아 삭제합니다.
 
-    s3 = boto3.client('s3')
+    하위 폴더(CommonPrefixes)마다 스레드를 나눠 목록을 동시에 조회하고,
+    찾은 키는 큐를 통해 하나의 삭제 스레드가 모아서 일괄 삭제합니다.
+    """
+
+    s3 = S3_CLIENT
     paginator = s3.get_paginator('list_objects_v2')
 
     found_count = 0
@@ -34,36 +138,34 @@ def find_and_delete_nfd_files():
         print("== [경고] 실제 삭제 모드입니다. 스크립트가 실행되면 파일이 영구적으로 삭제됩니다. ==")
     print("-" * 60)
 
-    try:
-        # Paginator 호출 시 Prefix 인자 추가
-        pages = paginator.paginate(Bucket=BUCKET_NAME, Prefix=PREFIX_TO_SCAN)
-
-        for page in pages:
-            if 'Contents' not in page:
-                continue
-
-            for obj in page['Contents']:
-                key = obj['Key']
-
-                normalized_key = unicodedata.normalize('NFC', key)
-
-                if key != normalized_key:
-                    found_count += 1
-                    print(f"\n[NFD 파일 발견] '{key}'")
-
-                    if not DRY_RUN:
-                        try:
-                            s3.delete_object(Bucket=BUCKET_NAME, Key=key)
-                            print(f"  -> [삭제 완료] 파일이 성공적으로 삭제되었습니다.")
-                            deleted_count += 1
-                        except Exception as e:
-                            print(f"  -> [삭제 실패] 파일 삭제 중 오류 발생: {e}")
-                    else:
-                        print(f"  -> [Dry Run] 실제 삭제를 건너뜁니다. (NFC 변환 시: '{normalized_key}')")
-
-    except Exception as e:
-        print(f"\n오류: S3 버킷 처리 중 문제가 발생했습니다. ({e})")
-        return
+    delete_queue = queue.Queue()
+
+    with ThreadPoolExecutor(max_workers=1) as writer_pool, ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        writer = writer_pool.submit(delete_writer, s3, delete_queue)
+        try:
+            # 바로 아래 단계의 하위 폴더 목록을 구하고, prefix 바로 아래에 있는 파일은 여기서 검사합니다.
+            sub_prefixes = []
+            pages = paginator.paginate(Bucket=BUCKET_NAME, Prefix=PREFIX_TO_SCAN, Delimiter='/')
+            for page in pages:
+                sub_prefixes += [p['Prefix'] for p in page.get('CommonPrefixes', [])]
+                for obj in page.get('Contents', []):
+                    if check_key(obj['Key'], delete_queue):
+                        found_count += 1
+
+            futures = {pool.submit(scan_prefix, s3, prefix, delete_queue): prefix for prefix in sub_prefixes}
+            for future, prefix in futures.items():
+                try:
+                    found_count += future.result()
+                except Exception as e:
+                    print(f"\n오류: '{prefix}' 처리 중 문제가 발생했습니다. ({e})")
+
+        except Exception as e:
+            print(f"\n오류: S3 버킷 처리 중 문제가 발생했습니다. ({e})")
+            return
+        finally:
+            # 삭제 스레드에 종료 신호를 보냅니다.
+            delete_queue.put(None)
+            deleted_count = writer.result()
 
     print("\n" + "=" * 60)
     print("모든 작업이 완료되었습니다.")